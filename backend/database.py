@@ -1,8 +1,13 @@
 import os
+import asyncio
+import struct
 from motor.motor_asyncio import AsyncIOMotorClient
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import bson
 from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import UpdateOne
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,6 +29,13 @@ def prepare_filter_dict(filter_dict: dict) -> dict:
     
     return prepared_dict
 
+def append_raw_fields(raw_document: RawBSONDocument, fields: dict) -> RawBSONDocument:
+    """Append fields to an already encoded document without re-encoding it"""
+    extra = bson.encode(fields)
+    # Splice the element lists: drop the int32 length prefix and trailing NUL
+    body = raw_document.raw[4:-1] + extra[4:-1]
+    return RawBSONDocument(struct.pack("<i", len(body) + 5) + body + b"\x00")
+
 class Database:
     client: Optional[AsyncIOMotorClient] = None
     database = None
@@ -36,7 +48,11 @@ async def get_database():
 async def connect_to_mongo():
     """Create database connection"""
     try:
-        db.client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        mongo_url = os.environ['MONGO_URL']
+        client_options = {}
+        if "maxpoolsize" not in mongo_url.lower():
+            client_options["maxPoolSize"] = 10
+        db.client = AsyncIOMotorClient(mongo_url, **client_options)
         db.database = db.client[os.environ['DB_NAME']]
         
         # Test the connection
@@ -50,6 +66,15 @@ async def connect_to_mongo():
         logger.error(f"Could not connect to MongoDB: {e}")
         raise
 
+async def warmup_pool(n: int = 4):
+    """Open pooled connections up front by issuing concurrent pings"""
+    try:
+        database = await get_database()
+        await asyncio.gather(*(database.command("ping") for _ in range(n)))
+        logger.info(f"Warmed up {n} MongoDB connections")
+    except Exception as e:
+        logger.warning(f"Error warming up connection pool: {e}")
+
 async def close_mongo_connection():
     """Close database connection"""
     if db.client:
@@ -111,6 +136,31 @@ async def insert_document(collection_name: str, document: dict) -> str:
     result = await collection.insert_one(document)
     return str(result.inserted_id)
 
+async def bulk_upsert_documents(collection_name: str, documents: List[Any]) -> int:
+    """Insert documents whose _id is not stored yet in a single round trip"""
+    if not documents:
+        return 0
+    
+    collection = await get_collection(collection_name)
+    
+    # Add timestamps, splicing them onto pre-encoded documents
+    now = datetime.utcnow()
+    timestamps = {"created_at": now, "updated_at": now}
+    requests = []
+    for document in documents:
+        if isinstance(document, RawBSONDocument):
+            stamped = append_raw_fields(document, timestamps)
+        else:
+            stamped = {**document, **timestamps}
+        requests.append(UpdateOne(
+            {"_id": document["_id"]},
+            {"$setOnInsert": stamped},
+            upsert=True
+        ))
+    
+    result = await collection.bulk_write(requests, ordered=False)
+    return result.upserted_count
+
 async def find_documents(
     collection_name: str,
     filter_dict: dict = None,
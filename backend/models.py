@@ -186,6 +186,9 @@ class Plugin(BaseDBModel):
     features: List[str] = []
     dependencies: List[str] = []
     hooks: Dict[str, Any] = {}
+    hook_names: List[str] = []
+    hook_types: List[str] = []
+    hook_descs: List[str] = []
     settings_schema: Dict[str, Any] = {}
     settings: Dict[str, Any] = {}
     install_path: Optional[str] = None
@@ -205,6 +208,9 @@ class PluginResponse(BaseModel):
     features: List[str] = []
     dependencies: List[str] = []
     hooks: Dict[str, Any] = {}
+    hook_names: List[str] = []
+    hook_types: List[str] = []
+    hook_descs: List[str] = []
     settings_schema: Dict[str, Any] = {}
     settings: Dict[str, Any] = {}
     created_at: datetime
@@ -11,11 +11,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def split_hooks(hooks: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Split a plugin.json hooks mapping into parallel name/type/description lists"""
+    hook_names = list(hooks)
+    return {
+        "hook_names": hook_names,
+        "hook_types": [hooks[name].get("type", "") for name in hook_names],
+        "hook_descs": [hooks[name].get("description", "") for name in hook_names]
+    }
+
+def get_hook_names(plugin: Plugin) -> List[str]:
+    """Get hook names for a plugin, falling back to the legacy hooks mapping"""
+    return plugin.hook_names or list(plugin.hooks)
+
 class PluginManager:
     """Revolutionary plugin management system for CMS Pro"""
     
     def __init__(self):
         self.loaded_plugins: Dict[str, Any] = {}
+        self.loaded_count = 0
         self.hook_registry: Dict[str, List[Callable]] = {}
         self.plugin_hooks: Dict[str, Dict[str, Any]] = {}
         self.plugins_dir = Path("/app/plugins")
@@ -97,7 +111,7 @@ class PluginManager:
                     "price": plugin_config.get('price', 'Free'),
                     "features": plugin_config.get('features', []),
                     "dependencies": plugin_config.get('dependencies', []),
-                    "hooks": plugin_config.get('hooks', {}),
+                    **split_hooks(plugin_config.get('hooks', {})),
                     "settings_schema": plugin_config.get('settings_schema', {}),
                     "settings": {},
                     "install_path": str(plugin_dir),
@@ -144,6 +158,8 @@ class PluginManager:
                 {"status": PluginStatus.ACTIVE}
             )
             
+            if plugin_id not in self.loaded_plugins:
+                self.loaded_count += 1
             self.loaded_plugins[plugin_id] = plugin
             
             logger.info(f"Plugin {plugin.name} activated successfully")
@@ -172,6 +188,7 @@ class PluginManager:
             
             if plugin_id in self.loaded_plugins:
                 del self.loaded_plugins[plugin_id]
+                self.loaded_count -= 1
             
             logger.info(f"Plugin {plugin_id} deactivated successfully")
             return True
@@ -269,6 +286,8 @@ class PluginManager:
             for plugin_doc in active_plugins:
                 plugin = Plugin(**plugin_doc)
                 await self._load_plugin_hooks(plugin)
+                if plugin.id not in self.loaded_plugins:
+                    self.loaded_count += 1
                 self.loaded_plugins[plugin.id] = plugin
             
             logger.info(f"Loaded {len(active_plugins)} active plugins")
@@ -279,7 +298,8 @@ class PluginManager:
     async def _load_plugin_hooks(self, plugin: Plugin):
         """Load hooks from a plugin"""
         try:
-            if not plugin.hooks:
+            hook_names = get_hook_names(plugin)
+            if not hook_names:
                 return
             
             plugin_dir = Path(plugin.install_path) if plugin.install_path else None
@@ -293,7 +313,15 @@ class PluginManager:
                 await self._load_backend_hooks(plugin, backend_hooks_file)
             
             # Store plugin hooks for frontend
-            self.plugin_hooks[plugin.id] = plugin.hooks
+            if plugin.hook_names:
+                self.plugin_hooks[plugin.id] = {
+                    name: {"type": hook_type, "description": description}
+                    for name, hook_type, description in zip(
+                        plugin.hook_names, plugin.hook_types, plugin.hook_descs
+                    )
+                }
+            else:
+                self.plugin_hooks[plugin.id] = plugin.hooks
             
         except Exception as e:
             logger.error(f"Error loading hooks for plugin {plugin.name}: {e}")
@@ -310,7 +338,7 @@ class PluginManager:
             spec.loader.exec_module(hooks_module)
             
             # Register hook functions
-            for hook_name, hook_config in plugin.hooks.items():
+            for hook_name in get_hook_names(plugin):
                 if hasattr(hooks_module, hook_name):
                     hook_func = getattr(hooks_module, hook_name)
                     hook_func.plugin_id = plugin.id
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import Dict, Any, List
+from collections import deque
 
 from models import DashboardStats, User, UserRole, ContentStatus, PluginStatus
 from auth import get_current_active_user
@@ -26,8 +27,8 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_active_us
         total_users = await count_documents("users", {"is_active": True}) if current_user.role in [UserRole.ADMIN, UserRole.EDITOR] else 0
         active_plugins = await count_documents("plugins", {"status": PluginStatus.ACTIVE})
 
-        # Recent activity
-        recent_activity = []
+        # Recent activity; a deque lets dashboard_stats hooks prepend in O(1)
+        recent_activity = deque()
         
         # Recent posts
         recent_posts = await find_documents(
@@ -85,6 +86,8 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_active_us
             "active_plugins": active_plugins,
             "recent_activity": recent_activity
         })
+        # Serialize the activity deque as a list only at the response boundary
+        stats_data["recent_activity"] = list(stats_data.get("recent_activity", []))
 
         return DashboardStats(**stats_data)
 
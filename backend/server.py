@@ -6,7 +6,7 @@ import logging
 from pathlib import Path
 
 # Import our modules
-from database import connect_to_mongo, close_mongo_connection
+from database import connect_to_mongo, close_mongo_connection, warmup_pool
 from plugin_system import plugin_manager
 from seed_data import seed_database
 
@@ -18,13 +18,25 @@ from routes.plugin_routes import router as plugin_router
 from routes.dashboard_routes import router as dashboard_router
 
 ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
+# Only parse .env once per process, even if this module is re-imported
+if not os.environ.get("_ENV_LOADED"):
+    load_dotenv(ROOT_DIR / '.env')
+    os.environ["_ENV_LOADED"] = "1"
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# A single root handler with a '{'-style formatter; dropping the millisecond
+# suffix saves a second string format on every record. Like basicConfig, this
+# leaves an already configured root logger alone.
+if not logging.root.handlers:
+    log_formatter = logging.Formatter(
+        '{asctime} - {name} - {levelname} - {message}',
+        style='{'
+    )
+    log_formatter.default_msec_format = None
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(log_formatter)
+    logging.root.addHandler(log_handler)
+    logging.root.setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create the main app
@@ -52,7 +64,7 @@ async def health_check():
     return {
         "status": "healthy",
         "database": "connected",
-        "plugins": len(plugin_manager.loaded_plugins)
+        "plugins": plugin_manager.loaded_count
     }
 
 # Include all routers
@@ -69,7 +81,11 @@ app.include_router(api_router)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
-    allow_origins=["*"],
+    allow_origins=[
+        origin.strip()
+        for origin in os.environ.get("CORS_ORIGINS", "http://localhost:3000").split(",")
+        if origin.strip()
+    ],
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -82,6 +98,7 @@ async def startup_event():
         
         # Connect to MongoDB
         await connect_to_mongo()
+        await warmup_pool(n=4)
         
         # Seed database with initial data
         await seed_database()
@@ -5,23 +5,47 @@ Tests all backend endpoints for the revolutionary WordPress clone with plugin-fi
 """
 
 import asyncio
-import aiohttp
+import contextvars
+import importlib.util
+import httpx
 import json
+import orjson
 import sys
 import os
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+# Prefer a faster event loop when one is installed. uvloop (libuv) works
+# everywhere httpx does; uringcore needs io_uring, i.e. Linux >= 5.11.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    if sys.platform.startswith("linux"):
+        try:
+            import uringcore
+            asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        except ImportError:
+            pass
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 # Configuration
 BASE_URL = "https://wpfullstack.preview.emergentagent.com/api"
 ADMIN_EMAIL = "admin@cms.com"
 ADMIN_PASSWORD = "admin123"
 
+# Per-task log buffer so concurrently run tests still print in submission order
+_task_log = contextvars.ContextVar("task_log", default=None)
+
 class CMSProTester:
     def __init__(self):
-        self.session = None
+        self.client = None
         self.auth_token = None
+        self._auth_headers = {}
         self.test_results = []
+        self._log_buffer = []
         self.created_resources = {
             'users': [],
             'posts': [],
@@ -30,24 +54,36 @@ class CMSProTester:
     
     async def setup(self):
         """Initialize test session"""
-        self.session = aiohttp.ClientSession()
+        # Every test hits a single origin, so HTTP/2 multiplexes all requests
+        # over one kept-alive TLS connection; without h2, fall back to pooled HTTP/1.1
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            base_url=BASE_URL,
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+            timeout=httpx.Timeout(30)
+        )
         print(f"🚀 Starting CMS Pro Backend API Tests")
         print(f"📡 Base URL: {BASE_URL}")
+        if not HTTP2_AVAILABLE:
+            print("⚠️  h2 not installed - using HTTP/1.1 (pip install 'httpx[http2]')")
         print("=" * 60)
     
     async def cleanup(self):
         """Cleanup test session and resources"""
-        if self.session:
-            await self.session.close()
+        if self.client:
+            await self.client.aclose()
     
     def log_test(self, test_name: str, success: bool, details: str = "", response_data: Any = None):
         """Log test result"""
         status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
+        lines = [f"{status} {test_name}"]
         if details:
-            print(f"    📝 {details}")
+            lines.append(f"    📝 {details}")
         if not success and response_data:
-            print(f"    🔍 Response: {response_data}")
+            lines.append(f"    🔍 Response: {response_data}")
+        
+        self.emit(*lines)
         
         self.test_results.append({
             'test': test_name,
@@ -56,30 +92,50 @@ class CMSProTester:
             'timestamp': datetime.now().isoformat()
         })
     
+    def emit(self, *lines: str):
+        """Queue report lines; they are written out in print_summary"""
+        buffer = _task_log.get()
+        (self._log_buffer if buffer is None else buffer).extend(lines)
+    
+    async def _buffered(self, test) -> tuple:
+        """Await a test while capturing its log output"""
+        buffer = []
+        _task_log.set(buffer)
+        result = await test
+        return result, buffer
+    
+    async def run_concurrently(self, *tests) -> list:
+        """Run independent tests concurrently and return their results in order"""
+        # A TaskGroup cancels the rest of the group as soon as one test raises
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(self._buffered(test)) for test in tests]
+        outcomes = [task.result() for task in tasks]
+        for _, buffer in outcomes:
+            self._log_buffer.extend(buffer)
+        return [result for result, _ in outcomes]
+    
     async def make_request(self, method: str, endpoint: str, data: Dict = None, 
                           headers: Dict = None, auth_required: bool = True) -> tuple:
         """Make HTTP request with error handling"""
-        url = f"{BASE_URL}{endpoint}"
-        request_headers = {"Content-Type": "application/json"}
-        
-        if auth_required and self.auth_token:
-            request_headers["Authorization"] = f"Bearer {self.auth_token}"
-        
-        if headers:
-            request_headers.update(headers)
+        # Content-Type is a client default; only allocate when merging overrides
+        if auth_required:
+            request_headers = {**self._auth_headers, **headers} if headers else self._auth_headers
+        else:
+            request_headers = headers
         
         try:
-            async with self.session.request(
-                method, url, 
+            response = await self.client.request(
+                method, endpoint,
                 json=data if data else None,
                 headers=request_headers
-            ) as response:
-                try:
-                    response_data = await response.json()
-                except:
-                    response_data = await response.text()
-                
-                return response.status, response_data
+            )
+            # Only JSON bodies go through the parser; anything else is kept as text
+            if 'json' in response.headers.get('content-type', ''):
+                response_data = orjson.loads(response.content)
+            else:
+                response_data = response.text
+            
+            return response.status_code, response_data
         except Exception as e:
             return 0, str(e)
     
@@ -104,6 +160,7 @@ class CMSProTester:
         
         if status == 200 and isinstance(data, dict) and "access_token" in data:
             self.auth_token = data["access_token"]
+            self._auth_headers = {"Authorization": f"Bearer {self.auth_token}"}
             self.log_test("Admin Login", True, f"Token expires in {data.get('expires_in', 0)} seconds")
             return True
         else:
@@ -143,9 +200,9 @@ class CMSProTester:
         status, data = await self.make_request("GET", "/users/stats")
         
         if status == 200 and isinstance(data, dict) and "total" in data:
+            total, admin, editor, author = map(data.get, ('total', 'admin', 'editor', 'author'))
             self.log_test("Get User Stats", True, 
-                         f"Total: {data.get('total')}, Admin: {data.get('admin')}, "
-                         f"Editor: {data.get('editor')}, Author: {data.get('author')}")
+                         f"Total: {total}, Admin: {admin}, Editor: {editor}, Author: {author}")
         else:
             self.log_test("Get User Stats", False, f"Status: {status}", data)
     
@@ -182,9 +239,9 @@ class CMSProTester:
         status, data = await self.make_request("GET", "/posts/stats")
         
         if status == 200 and isinstance(data, dict) and "total" in data:
+            total, published, draft, private = map(data.get, ('total', 'published', 'draft', 'private'))
             self.log_test("Get Post Stats", True, 
-                         f"Total: {data.get('total')}, Published: {data.get('published')}, "
-                         f"Draft: {data.get('draft')}, Private: {data.get('private')}")
+                         f"Total: {total}, Published: {published}, Draft: {draft}, Private: {private}")
         else:
             self.log_test("Get Post Stats", False, f"Status: {status}", data)
     
@@ -289,10 +346,14 @@ class CMSProTester:
             # Test deactivation
             status, data = await self.make_request("PUT", f"/plugins/{plugin_id}/deactivate")
             if status == 200:
+                # Send the reactivation before logging so it is already in flight
+                reactivation = asyncio.create_task(
+                    self.make_request("PUT", f"/plugins/{plugin_id}/activate")
+                )
                 self.log_test("Plugin Deactivation", True, f"Deactivated plugin: {plugin.get('name')}")
                 
                 # Reactivate it
-                status, data = await self.make_request("PUT", f"/plugins/{plugin_id}/activate")
+                status, data = await reactivation
                 if status == 200:
                     self.log_test("Plugin Reactivation", True, f"Reactivated plugin: {plugin.get('name')}")
                 else:
@@ -329,9 +390,11 @@ class CMSProTester:
         status, data = await self.make_request("GET", "/dashboard/stats")
         
         if status == 200 and isinstance(data, dict):
+            posts, pages, users, plugins = map(
+                data.get, ('total_posts', 'total_pages', 'total_users', 'active_plugins')
+            )
             self.log_test("Dashboard Stats", True, 
-                         f"Posts: {data.get('total_posts')}, Pages: {data.get('total_pages')}, "
-                         f"Users: {data.get('total_users')}, Active Plugins: {data.get('active_plugins')}")
+                         f"Posts: {posts}, Pages: {pages}, Users: {users}, Active Plugins: {plugins}")
         else:
             self.log_test("Dashboard Stats", False, f"Status: {status}", data)
     
@@ -359,19 +422,16 @@ class CMSProTester:
     # Cleanup Tests
     async def test_cleanup_created_resources(self):
         """Clean up resources created during testing"""
-        cleanup_count = 0
-        
-        # Delete created posts
-        for post_id in self.created_resources['posts']:
-            status, data = await self.make_request("DELETE", f"/posts/{post_id}")
-            if status == 200:
-                cleanup_count += 1
-        
-        # Delete created users
-        for user_id in self.created_resources['users']:
-            status, data = await self.make_request("DELETE", f"/users/{user_id}")
-            if status == 200:
-                cleanup_count += 1
+        # Deletes are independent, so issue them all at once
+        results = await asyncio.gather(
+            *[self.make_request("DELETE", f"/posts/{post_id}") for post_id in self.created_resources['posts']],
+            *[self.make_request("DELETE", f"/users/{user_id}") for user_id in self.created_resources['users']],
+            return_exceptions=True
+        )
+        cleanup_count = sum(
+            1 for result in results
+            if not isinstance(result, Exception) and result[0] == 200
+        )
         
         self.log_test("Resource Cleanup", True, f"Cleaned up {cleanup_count} test resources")
     
@@ -380,52 +440,62 @@ class CMSProTester:
         await self.setup()
         
         try:
-            print("🔐 AUTHENTICATION TESTS")
-            print("-" * 30)
-            await self.test_health_check()
-            
+            self.emit("🔐 AUTHENTICATION TESTS")
+            self.emit("-" * 30)
             # Login is critical - if it fails, most other tests will fail
-            if not await self.test_login():
-                print("❌ Login failed - cannot continue with authenticated tests")
+            _, logged_in = await self.run_concurrently(
+                self.test_health_check(),
+                self.test_login()
+            )
+            if not logged_in:
+                self.emit("❌ Login failed - cannot continue with authenticated tests")
                 return
             
             await self.test_get_current_user()
             
-            print("\n👥 USER MANAGEMENT TESTS")
-            print("-" * 30)
-            await self.test_get_users()
-            await self.test_get_user_stats()
+            self.emit("\n👥 USER MANAGEMENT TESTS")
+            self.emit("-" * 30)
+            await self.run_concurrently(
+                self.test_get_users(),
+                self.test_get_user_stats(),
+                self.test_role_based_access()
+            )
             await self.test_create_user()
-            await self.test_role_based_access()
             
-            print("\n📝 CONTENT MANAGEMENT TESTS")
-            print("-" * 30)
-            await self.test_get_posts()
-            await self.test_get_post_stats()
+            self.emit("\n📝 CONTENT MANAGEMENT TESTS")
+            self.emit("-" * 30)
+            await self.run_concurrently(
+                self.test_get_posts(),
+                self.test_get_post_stats()
+            )
             post_id = await self.test_create_post()
             await self.test_update_post(post_id)
             await self.test_get_specific_post(post_id)
             
-            print("\n🔌 REVOLUTIONARY PLUGIN SYSTEM TESTS")
-            print("-" * 30)
-            plugins = await self.test_get_plugins()
-            active_plugins = await self.test_get_active_plugins()
-            await self.test_get_plugin_hooks()
+            self.emit("\n🔌 REVOLUTIONARY PLUGIN SYSTEM TESTS")
+            self.emit("-" * 30)
+            plugins, active_plugins, _ = await self.run_concurrently(
+                self.test_get_plugins(),
+                self.test_get_active_plugins(),
+                self.test_get_plugin_hooks()
+            )
             await self.test_plugin_activation(plugins)
             await self.test_execute_plugin_hook()
             
-            print("\n📊 DASHBOARD TESTS")
-            print("-" * 30)
-            await self.test_dashboard_stats()
-            await self.test_dashboard_activity()
+            self.emit("\n📊 DASHBOARD TESTS")
+            self.emit("-" * 30)
+            await self.run_concurrently(
+                self.test_dashboard_stats(),
+                self.test_dashboard_activity()
+            )
             
-            print("\n🧹 CLEANUP TESTS")
-            print("-" * 30)
+            self.emit("\n🧹 CLEANUP TESTS")
+            self.emit("-" * 30)
             await self.test_cleanup_created_resources()
             await self.test_logout()
             
         except Exception as e:
-            print(f"❌ Test execution error: {e}")
+            self.emit(f"❌ Test execution error: {e}")
         
         finally:
             await self.cleanup()
@@ -433,6 +503,10 @@ class CMSProTester:
     
     def print_summary(self):
         """Print test summary"""
+        if self._log_buffer:
+            sys.stdout.write("\n".join(self._log_buffer) + "\n")
+            self._log_buffer.clear()
+        
         print("\n" + "=" * 60)
         print("📋 TEST SUMMARY")
         print("=" * 60)
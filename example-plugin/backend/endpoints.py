@@ -1,18 +1,61 @@
 # Custom API endpoints for Analytics Plugin
-from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Dict, Any, Optional
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, Any, Iterator, Literal, Optional
+from datetime import datetime, timedelta
 import logging
+import time
+import numpy as np
+import orjson
 from .hooks import get_analytics_data
 
 logger = logging.getLogger(__name__)
 
+_rng = np.random.default_rng()
+
+# Fixed structure of the simulated traffic report; only the counts are random
+_HOUR_LABELS = tuple(f"{i:02d}:00" for i in range(24))
+_COUNTRIES = ("United States", "United Kingdom", "Germany", "France", "Canada")
+_COUNTRY_LOW = np.array([500, 200, 100, 80, 60])
+_COUNTRY_HIGH = np.array([1000, 500, 300, 200, 150]) + 1
+
+# Rolling window of the last 7 dates, rebuilt only when the UTC day changes
+_DATES_CACHE = {"day": None, "dates": []}
+
+def _last_seven_dates() -> list:
+    """Get the last 7 UTC dates as YYYY-MM-DD strings, newest first"""
+    today = datetime.utcnow().date()
+    if _DATES_CACHE["day"] != today:
+        _DATES_CACHE["dates"] = [(today - timedelta(days=i)).isoformat() for i in range(7)]
+        _DATES_CACHE["day"] = today
+    return _DATES_CACHE["dates"]
+
+def request_now() -> datetime:
+    """Current UTC time, read once per request"""
+    return datetime.utcnow()
+
+def request_now_iso(now: datetime = Depends(request_now)) -> str:
+    """Current UTC time in ISO format, from the same per-request reading"""
+    return now.isoformat()
+
+def _stream_json(analytics_data: Dict[str, Any], export_date: str) -> Iterator[bytes]:
+    """Encode a JSON export one top-level field at a time"""
+    yield b'{"success":true,"format":"json","data":{'
+    for index, (key, value) in enumerate(analytics_data.items()):
+        yield (b',' if index else b'') + orjson.dumps(key) + b':' + orjson.dumps(value)
+    yield b'},"export_date":' + orjson.dumps(export_date) + b'}'
+
 # Create router for analytics endpoints
-analytics_router = APIRouter(prefix="/analytics", tags=["analytics"])
+analytics_router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    default_response_class=ORJSONResponse
+)
 
 @analytics_router.get("/stats")
 async def get_analytics_stats(
-    period: str = Query('30days', regex='^(7days|30days|90days)$'),
+    period: Literal['7days', '30days', '90days'] = '30days',
+    now_iso: str = Depends(request_now_iso),
     # current_user: User = Depends(get_current_active_user)  # Uncomment when integrated
 ):
     """Get analytics statistics for specified period"""
@@ -22,7 +65,7 @@ async def get_analytics_stats(
         return {
             "success": True,
             "data": analytics_data,
-            "generated_at": datetime.utcnow().isoformat()
+            "generated_at": now_iso
         }
         
     except Exception as e:
@@ -37,26 +80,30 @@ async def get_traffic_data(
 ):
     """Get detailed traffic analytics"""
     try:
-        # Simulate traffic data
+        # Simulate traffic data, drawing each group of counts in one call
+        hourly_visitors = _rng.integers(50, 201, size=24).tolist()
+        daily_visitors = _rng.integers(200, 801, size=7).tolist()
+        daily_page_views = _rng.integers(500, 2001, size=7).tolist()
+        country_visitors = _rng.integers(_COUNTRY_LOW, _COUNTRY_HIGH).tolist()
+        
         traffic_data = {
             "hourly_traffic": [
-                {"hour": f"{i:02d}:00", "visitors": random.randint(50, 200)} 
-                for i in range(24)
+                {"hour": hour, "visitors": visitors}
+                for hour, visitors in zip(_HOUR_LABELS, hourly_visitors)
             ],
             "daily_traffic": [
                 {
-                    "date": (datetime.utcnow() - timedelta(days=i)).strftime("%Y-%m-%d"),
-                    "visitors": random.randint(200, 800),
-                    "page_views": random.randint(500, 2000)
+                    "date": day,
+                    "visitors": visitors,
+                    "page_views": page_views
                 }
-                for i in range(7)
+                for day, visitors, page_views in zip(
+                    _last_seven_dates(), daily_visitors, daily_page_views
+                )
             ],
             "top_countries": [
-                {"country": "United States", "visitors": random.randint(500, 1000)},
-                {"country": "United Kingdom", "visitors": random.randint(200, 500)},
-                {"country": "Germany", "visitors": random.randint(100, 300)},
-                {"country": "France", "visitors": random.randint(80, 200)},
-                {"country": "Canada", "visitors": random.randint(60, 150)}
+                {"country": country, "visitors": visitors}
+                for country, visitors in zip(_COUNTRIES, country_visitors)
             ]
         }
         
@@ -72,6 +119,7 @@ async def get_traffic_data(
 @analytics_router.post("/track-event")
 async def track_custom_event(
     event_data: Dict[str, Any],
+    now_iso: str = Depends(request_now_iso),
     # current_user: User = Depends(get_current_active_user)
 ):
     """Track custom analytics event"""
@@ -80,8 +128,8 @@ async def track_custom_event(
         # or send it to an analytics service
         
         tracked_event = {
-            "event_id": f"evt_{int(datetime.utcnow().timestamp())}",
-            "timestamp": datetime.utcnow().isoformat(),
+            "event_id": f"evt_{time.time_ns() // 1_000_000_000}",
+            "timestamp": now_iso,
             "event_type": event_data.get("type", "custom"),
             "event_data": event_data,
             "user_id": "current_user.id if authenticated else None"
@@ -101,8 +149,9 @@ async def track_custom_event(
 
 @analytics_router.get("/reports/export")
 async def export_analytics_report(
-    format: str = Query('csv', regex='^(csv|json|pdf)$'),
-    period: str = Query('30days', regex='^(7days|30days|90days)$'),
+    format: Literal['csv', 'json', 'pdf'] = 'csv',
+    period: Literal['7days', '30days', '90days'] = '30days',
+    now: datetime = Depends(request_now),
     # current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
     """Export analytics report in specified format"""
@@ -110,25 +159,19 @@ async def export_analytics_report(
         analytics_data = get_analytics_data(period)
         
         if format == 'json':
-            return {
-                "success": True,
-                "format": "json",
-                "data": analytics_data,
-                "export_date": datetime.utcnow().isoformat()
-            }
+            return StreamingResponse(
+                _stream_json(analytics_data, now.isoformat()),
+                media_type="application/json"
+            )
         
         # For CSV and PDF, you would generate the appropriate file
         return {
             "success": True,
             "message": f"Analytics report exported in {format.upper()} format",
             "download_url": f"/api/analytics/download/{period}.{format}",
-            "expires_at": (datetime.utcnow() + timedelta(hours=1)).isoformat()
+            "expires_at": (now + timedelta(hours=1)).isoformat()
         }
         
     except Exception as e:
         logger.error(f"Error exporting report: {e}")
         raise HTTPException(status_code=500, detail="Failed to export report")
-
-# Required imports for the endpoints (add to top of file in real implementation)
-import random
-from datetime import timedelta
\ No newline at end of file
@@ -1,19 +1,30 @@
 # Backend hooks for Custom Analytics Plugin
 from datetime import datetime, timedelta
-import random
+import time
+from collections import deque
+from functools import lru_cache
 from typing import Dict, Any
+import numpy as np
+
+_rng = np.random.default_rng()
+
+# Inclusive (low, high) bounds for each batch of simulated figures
+_DASHBOARD_LOW = np.array([10000, 2000, 25, 5])
+_DASHBOARD_HIGH = np.array([15000, 4000, 40, 25]) + 1
+_ANALYTICS_LOW = np.array([50000, 10000, 25, 5000, 2000, 1000, 500, 30, 25, 10, 5])
+_ANALYTICS_HIGH = np.array([100000, 25000, 45, 10000, 5000, 3000, 1500, 50, 40, 20, 15]) + 1
 
 async def dashboard_stats(data: Dict[str, Any]) -> Dict[str, Any]:
     """Add custom analytics stats to dashboard"""
     
     # Simulate analytics data (replace with real analytics logic)
-    page_views = random.randint(10000, 15000)
-    unique_visitors = random.randint(2000, 4000)
-    bounce_rate = f"{random.randint(25, 40)}%"
+    page_views, unique_visitors, bounce, traffic_increase = (
+        _rng.integers(_DASHBOARD_LOW, _DASHBOARD_HIGH).tolist()
+    )
+    bounce_rate = f"{bounce}%"
     
     # Add custom stats
-    custom_stats = data.get('stats', {})
-    custom_stats.update({
+    data.setdefault('stats', {}).update({
         'page_views': page_views,
         'unique_visitors': unique_visitors,
         'bounce_rate': bounce_rate,
@@ -24,19 +35,18 @@ async def dashboard_stats(data: Dict[str, Any]) -> Dict[str, Any]:
     analytics_activity = {
         'type': 'analytics',
         'title': f'Analytics Update: {page_views:,} page views today',
-        'description': f'Traffic increased by {random.randint(5, 25)}% compared to yesterday',
+        'description': f'Traffic increased by {traffic_increase}% compared to yesterday',
         'timestamp': datetime.utcnow().isoformat(),
         'icon': 'TrendingUp'
     }
     
-    recent_activity = data.get('recent_activity', [])
-    recent_activity.insert(0, analytics_activity)
+    # The dashboard route passes a deque; other callers may still send a list
+    recent_activity = data.get('recent_activity')
+    if not isinstance(recent_activity, deque):
+        recent_activity = data['recent_activity'] = deque(recent_activity or ())
+    recent_activity.appendleft(analytics_activity)
     
-    return {
-        **data,
-        'stats': custom_stats,
-        'recent_activity': recent_activity
-    }
+    return data
 
 async def before_post_save(post_data: Dict[str, Any]) -> Dict[str, Any]:
     """Track post analytics before saving"""
@@ -44,7 +54,7 @@ async def before_post_save(post_data: Dict[str, Any]) -> Dict[str, Any]:
     # Add analytics tracking metadata
     post_data['analytics'] = {
         'tracked': True,
-        'tracking_id': f"post_{post_data.get('id', 'new')}_{int(datetime.utcnow().timestamp())}",
+        'tracking_id': f"post_{post_data.get('id', 'new')}_{time.time_ns() // 1_000_000_000}",
         'created_at': datetime.utcnow().isoformat()
     }
     
@@ -64,6 +74,12 @@ async def after_post_save(post_data: Dict[str, Any]) -> Dict[str, Any]:
 
 def get_analytics_data(period: str = '30days') -> Dict[str, Any]:
     """Get analytics data for specified period"""
+    # Regenerate at most once a minute per period
+    return _build_analytics_data(period, int(time.time() // 60))
+
+@lru_cache(maxsize=8)
+def _build_analytics_data(period: str, bucket: int) -> Dict[str, Any]:
+    """Build analytics data for a period; bucket only keys the cache"""
     
     # Simulate analytics data generation
     end_date = datetime.utcnow()
@@ -78,23 +94,29 @@ def get_analytics_data(period: str = '30days') -> Dict[str, Any]:
         start_date = end_date - timedelta(days=30)
         multiplier = 2
     
+    (
+        page_views, unique_visitors, bounce,
+        home_views, blog_views, about_views, contact_views,
+        direct, search, social, referral
+    ) = _rng.integers(_ANALYTICS_LOW, _ANALYTICS_HIGH).tolist()
+    
     return {
         'period': period,
         'start_date': start_date.isoformat(),
         'end_date': end_date.isoformat(),
-        'total_page_views': random.randint(50000, 100000) * multiplier,
-        'unique_visitors': random.randint(10000, 25000) * multiplier,
-        'bounce_rate': f"{random.randint(25, 45)}%",
+        'total_page_views': page_views * multiplier,
+        'unique_visitors': unique_visitors * multiplier,
+        'bounce_rate': f"{bounce}%",
         'top_pages': [
-            {'path': '/', 'views': random.randint(5000, 10000)},
-            {'path': '/blog', 'views': random.randint(2000, 5000)},
-            {'path': '/about', 'views': random.randint(1000, 3000)},
-            {'path': '/contact', 'views': random.randint(500, 1500)}
+            {'path': '/', 'views': home_views},
+            {'path': '/blog', 'views': blog_views},
+            {'path': '/about', 'views': about_views},
+            {'path': '/contact', 'views': contact_views}
         ],
         'traffic_sources': {
-            'direct': f"{random.randint(30, 50)}%",
-            'search': f"{random.randint(25, 40)}%", 
-            'social': f"{random.randint(10, 20)}%",
-            'referral': f"{random.randint(5, 15)}%"
+            'direct': f"{direct}%",
+            'search': f"{search}%",
+            'social': f"{social}%",
+            'referral': f"{referral}%"
         }
     }
\ No newline at end of file
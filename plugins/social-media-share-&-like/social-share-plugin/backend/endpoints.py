@@ -1,14 +1,159 @@
 # Custom API endpoints for Social Media Share & Like Plugin
-from fastapi import APIRouter, HTTPException, Depends, Body
-from typing import Dict, Any, List
+from fastapi import APIRouter, HTTPException, Depends, Body, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import Dict, Any, List, AsyncIterator
 from datetime import datetime
+import asyncio
+import hashlib
 import logging
-from .hooks import track_like_event, track_share_event, get_platform_breakdown, get_engagement_trends
+import numpy as np
+import orjson
+from .hooks import (
+    track_like_event, track_share_event, get_platform_breakdown, get_engagement_trends,
+    async_ttl_cache, build_share_urls, SHARE_BASE_URL, VALID_PLATFORMS, VALID_PLATFORMS_SET
+)
 
 logger = logging.getLogger(__name__)
 
+_rng = np.random.default_rng()
+
+# Cap on share events tracked concurrently by a bulk share
+_BULK_SHARE_CONCURRENCY = 32
+
+# Upper bounds for the simulated per-platform share counts (exclusive)
+_PLATFORM_SHARES_HIGH = np.array([50, 40, 25, 60, 15, 20, 10]) + 1
+
+# Bounds for the simulated top posts' likes, shares and engagement score (high is exclusive)
+_TOP_POST_LOW = np.array([50, 25, 100])
+_TOP_POST_HIGH = np.array([1000, 500, 2000]) + 1
+_TOP_POST_PLATFORMS = ('facebook', 'twitter', 'linkedin', 'whatsapp')
+
+_INVALID_PLATFORM_DETAIL = f"Invalid platform. Must be one of: {list(VALID_PLATFORMS)}"
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or etag in tags
+
+def _etag_response(request: Request, data: Any, **fields: Any) -> Response:
+    """Respond 304 if the client already holds data, otherwise send fields plus data with its ETag"""
+    # data is encoded once and both hashed and spliced into the body; the
+    # other fields (timestamps included) stay out of the ETag
+    data_json = orjson.dumps(data)
+    etag = '"' + hashlib.blake2b(data_json, digest_size=16).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=60"}
+    
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    
+    body = orjson.dumps({**fields, "data": orjson.Fragment(data_json)})
+    return Response(body, media_type="application/json", headers=headers)
+
+# Mock figures are held for the TTL so repeated requests (and their ETags) agree;
+# post ids come from the client, so that cache is size-bounded like all the others
+@async_ttl_cache(ttl=300, maxsize=256)
+async def _post_social_stats(post_id: str) -> Dict[str, Any]:
+    """Social media statistics for one post"""
+    # In a real implementation, this would query the database
+    # For now, we'll return mock data
+    likes, total_shares, engagement_score = _rng.integers([10, 5, 50], [501, 201, 1001]).tolist()
+    platform_shares = _rng.integers(0, _PLATFORM_SHARES_HIGH).tolist()
+    
+    return {
+        "post_id": post_id,
+        "likes": likes,
+        "total_shares": total_shares,
+        "platform_shares": dict(zip(VALID_PLATFORMS, platform_shares)),
+        "engagement_score": engagement_score,
+        "last_shared": datetime.utcnow(),
+        "most_shared_platform": "facebook"  # Would calculate based on data
+    }
+
+@async_ttl_cache(ttl=300)
+async def _top_social_posts(metric: str, limit: int) -> List[Dict[str, Any]]:
+    """Top posts ranked by metric"""
+    # Mock top posts data
+    created_at = datetime.utcnow()
+    # One (limit, 3) draw for all the counts plus one for the platforms
+    counts = _rng.integers(_TOP_POST_LOW, _TOP_POST_HIGH, size=(limit, 3)).tolist()
+    platforms = _rng.choice(_TOP_POST_PLATFORMS, size=limit).tolist()
+    top_posts = []
+    for i, ((likes, shares, engagement_score), platform) in enumerate(zip(counts, platforms), 1):
+        post = {
+            "post_id": f"post_{i}",
+            "title": f"Top Post #{i} - Amazing Content!",
+            "likes": likes,
+            "shares": shares,
+            "engagement_score": engagement_score,
+            "created_at": created_at,
+            "author": f"Author {i}",
+            "top_platform": platform
+        }
+        top_posts.append(post)
+    
+    # Sort by requested metric
+    if metric == 'likes':
+        top_posts.sort(key=lambda x: x['likes'], reverse=True)
+    elif metric == 'shares':
+        top_posts.sort(key=lambda x: x['shares'], reverse=True)
+    else:  # engagement
+        top_posts.sort(key=lambda x: x['engagement_score'], reverse=True)
+    
+    return top_posts
+
+async def _track_bulk_share(post_id: str, platform: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Track one share of a bulk share and describe its outcome"""
+    try:
+        async with semaphore:
+            event_result = await track_share_event(post_id, platform, "current_user.id")
+    except Exception as e:
+        return {"post_id": post_id, "platform": platform, "success": False, "error": str(e)}
+    
+    return {"post_id": post_id, "platform": platform, "success": True, "event_id": event_result.get('event_id')}
+
+async def _stream_bulk_shares(post_ids: List[str], platforms: List[str]) -> AsyncIterator[bytes]:
+    """Encode each bulk share result as soon as it completes, then the summary"""
+    # Track every share concurrently, bounded so downstream writes aren't flooded
+    semaphore = asyncio.Semaphore(_BULK_SHARE_CONCURRENCY)
+    tasks = [
+        asyncio.ensure_future(_track_bulk_share(post_id, platform, semaphore))
+        for post_id in post_ids for platform in platforms
+    ]
+    successful_shares = 0
+    
+    try:
+        yield b'{"success":true,"results":['
+        for index, next_result in enumerate(asyncio.as_completed(tasks)):
+            result = await next_result
+            successful_shares += result["success"]
+            yield (b',' if index else b'') + orjson.dumps(result)
+    finally:
+        # Stop outstanding shares if the client goes away mid-stream
+        for task in tasks:
+            task.cancel()
+    
+    total_attempts = len(tasks)
+    # Drop the summary object's opening brace so its fields join the outer object
+    yield b'],' + orjson.dumps({
+        "message": f"Bulk share completed: {successful_shares}/{total_attempts} successful",
+        "summary": {
+            "total_posts": len(post_ids),
+            "total_platforms": len(platforms),
+            "successful_shares": successful_shares,
+            "failed_shares": total_attempts - successful_shares
+        }
+    })[1:]
+
 # Create router for social share endpoints
-social_router = APIRouter(prefix="/social", tags=["social-share"])
+# Handlers that carry datetime values return ORJSONResponse themselves: a plain
+# dict would still go through FastAPI's jsonable_encoder before orjson sees it
+social_router = APIRouter(
+    prefix="/social",
+    tags=["social-share"],
+    default_response_class=ORJSONResponse
+)
 
 @social_router.post("/posts/{post_id}/like")
 async def like_post(
@@ -35,13 +180,13 @@ async def like_post(
         else:
             new_like_count = max(0, new_like_count - 1)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "action": action,
             "new_like_count": new_like_count,
             "event_id": event_result.get('event_id'),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": datetime.utcnow()
+        })
         
     except Exception as e:
         logger.error(f"Error processing like for post {post_id}: {e}")
@@ -59,9 +204,8 @@ async def share_post(
         if not platform:
             raise HTTPException(status_code=400, detail="Platform is required")
         
-        valid_platforms = ['facebook', 'twitter', 'linkedin', 'whatsapp', 'telegram', 'reddit', 'pinterest']
-        if platform not in valid_platforms:
-            raise HTTPException(status_code=400, detail=f"Invalid platform. Must be one of: {valid_platforms}")
+        if platform not in VALID_PLATFORMS_SET:
+            raise HTTPException(status_code=400, detail=_INVALID_PLATFORM_DETAIL)
         
         user_id = "current_user.id if current_user else None"  # Anonymous shares allowed
         
@@ -72,13 +216,13 @@ async def share_post(
         # Increment both total shares and platform-specific shares
         new_share_count = share_data.get('current_count', 0) + 1
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "platform": platform,
             "new_share_count": new_share_count,
             "event_id": event_result.get('event_id'),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+            "timestamp": datetime.utcnow()
+        })
         
     except HTTPException:
         raise
@@ -89,36 +233,14 @@ async def share_post(
 @social_router.get("/posts/{post_id}/stats")
 async def get_post_social_stats(
     post_id: str,
+    request: Request,
     # current_user: User = Depends(get_current_active_user)
 ):
     """Get social media statistics for a specific post"""
     try:
-        # In a real implementation, this would query the database
-        # For now, we'll return mock data
-        import random
+        stats = await _post_social_stats(post_id)
         
-        stats = {
-            "post_id": post_id,
-            "likes": random.randint(10, 500),
-            "total_shares": random.randint(5, 200),
-            "platform_shares": {
-                "facebook": random.randint(0, 50),
-                "twitter": random.randint(0, 40), 
-                "linkedin": random.randint(0, 25),
-                "whatsapp": random.randint(0, 60),
-                "telegram": random.randint(0, 15),
-                "reddit": random.randint(0, 20),
-                "pinterest": random.randint(0, 10)
-            },
-            "engagement_score": random.randint(50, 1000),
-            "last_shared": datetime.utcnow().isoformat(),
-            "most_shared_platform": "facebook"  # Would calculate based on data
-        }
-        
-        return {
-            "success": True,
-            "data": stats
-        }
+        return _etag_response(request, stats, success=True)
         
     except Exception as e:
         logger.error(f"Error getting social stats for post {post_id}: {e}")
@@ -126,32 +248,42 @@ async def get_post_social_stats(
 
 @social_router.get("/analytics/overview")
 async def get_social_analytics_overview(
+    request: Request,
     period: str = "30days",
     # current_user: User = Depends(require_role(UserRole.EDITOR))
 ):
     """Get overall social media analytics"""
     try:
         # Get analytics data
-        platform_breakdown = get_platform_breakdown()
-        engagement_trends = get_engagement_trends()
+        # Both aggregates are served from the hooks' TTL cache when fresh
+        platform_breakdown = await get_platform_breakdown()
+        engagement_trends = await get_engagement_trends()
+        
+        # Total all three trend metrics in one pass
+        total_likes = total_shares = total_engagement = 0
+        for trend in engagement_trends:
+            total_likes += trend['likes']
+            total_shares += trend['shares']
+            total_engagement += trend['engagement_score']
         
         analytics_data = {
             "period": period,
-            "total_likes": sum([trend['likes'] for trend in engagement_trends]),
-            "total_shares": sum([trend['shares'] for trend in engagement_trends]),
+            "total_likes": total_likes,
+            "total_shares": total_shares,
             "platform_breakdown": platform_breakdown,
             "engagement_trends": engagement_trends,
             "top_performing_platform": max(platform_breakdown, key=platform_breakdown.get),
             "average_engagement_per_day": round(
-                sum([trend['engagement_score'] for trend in engagement_trends]) / len(engagement_trends), 2
+                total_engagement / len(engagement_trends), 2
             ) if engagement_trends else 0
         }
         
-        return {
-            "success": True,
-            "data": analytics_data,
-            "generated_at": datetime.utcnow().isoformat()
-        }
+        return _etag_response(
+            request,
+            analytics_data,
+            success=True,
+            generated_at=datetime.utcnow()
+        )
         
     except Exception as e:
         logger.error(f"Error getting social analytics: {e}")
@@ -159,8 +291,9 @@ async def get_social_analytics_overview(
 
 @social_router.get("/top-posts")
 async def get_top_social_posts(
+    request: Request,
     metric: str = "shares",  # 'likes', 'shares', or 'engagement'
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
     # current_user: User = Depends(get_current_active_user)
 ):
     """Get top performing posts by social media metrics"""
@@ -168,37 +301,9 @@ async def get_top_social_posts(
         if metric not in ['likes', 'shares', 'engagement']:
             raise HTTPException(status_code=400, detail="Metric must be 'likes', 'shares', or 'engagement'")
         
-        # Mock top posts data
-        import random
-        
-        top_posts = []
-        for i in range(1, limit + 1):
-            post = {
-                "post_id": f"post_{i}",
-                "title": f"Top Post #{i} - Amazing Content!",
-                "likes": random.randint(50, 1000),
-                "shares": random.randint(25, 500),
-                "engagement_score": random.randint(100, 2000),
-                "created_at": datetime.utcnow().isoformat(),
-                "author": f"Author {i}",
-                "top_platform": random.choice(['facebook', 'twitter', 'linkedin', 'whatsapp'])
-            }
-            top_posts.append(post)
-        
-        # Sort by requested metric
-        if metric == 'likes':
-            top_posts.sort(key=lambda x: x['likes'], reverse=True)
-        elif metric == 'shares':
-            top_posts.sort(key=lambda x: x['shares'], reverse=True)
-        else:  # engagement
-            top_posts.sort(key=lambda x: x['engagement_score'], reverse=True)
+        top_posts = await _top_social_posts(metric, limit)
         
-        return {
-            "success": True,
-            "metric": metric,
-            "limit": limit,
-            "data": top_posts
-        }
+        return _etag_response(request, top_posts, success=True, metric=metric, limit=limit)
         
     except HTTPException:
         raise
@@ -223,43 +328,11 @@ async def bulk_share_posts(
         if not platforms:
             raise HTTPException(status_code=400, detail="At least one platform is required")
         
-        results = []
-        
-        for post_id in post_ids:
-            for platform in platforms:
-                try:
-                    # Track each share
-                    event_result = await track_share_event(post_id, platform, "current_user.id")
-                    
-                    results.append({
-                        "post_id": post_id,
-                        "platform": platform,
-                        "success": True,
-                        "event_id": event_result.get('event_id')
-                    })
-                    
-                except Exception as e:
-                    results.append({
-                        "post_id": post_id,
-                        "platform": platform,
-                        "success": False,
-                        "error": str(e)
-                    })
-        
-        successful_shares = len([r for r in results if r['success']])
-        total_attempts = len(results)
-        
-        return {
-            "success": True,
-            "message": f"Bulk share completed: {successful_shares}/{total_attempts} successful",
-            "results": results,
-            "summary": {
-                "total_posts": len(post_ids),
-                "total_platforms": len(platforms),
-                "successful_shares": successful_shares,
-                "failed_shares": total_attempts - successful_shares
-            }
-        }
+        # Results are streamed in completion order rather than held until all finish
+        return StreamingResponse(
+            _stream_bulk_shares(post_ids, platforms),
+            media_type="application/json"
+        )
         
     except HTTPException:
         raise
@@ -276,26 +349,17 @@ async def get_share_urls(
     """Get pre-generated share URLs for all platforms"""
     try:
         # This would typically get post data from database
-        base_url = "https://your-cms-domain.com"  # Would be configured
-        post_url = f"{base_url}/posts/{post_id}"
+        post_url = f"{SHARE_BASE_URL}/posts/{post_id}"
         
-        share_urls = {
-            'facebook': f"https://www.facebook.com/sharer/sharer.php?u={post_url}",
-            'twitter': f"https://twitter.com/intent/tweet?text={custom_message}&url={post_url}",
-            'linkedin': f"https://www.linkedin.com/sharing/share-offsite/?url={post_url}",
-            'whatsapp': f"https://wa.me/?text={custom_message} {post_url}",
-            'telegram': f"https://t.me/share/url?url={post_url}&text={custom_message}",
-            'reddit': f"https://reddit.com/submit?url={post_url}&title={custom_message}",
-            'pinterest': f"https://pinterest.com/pin/create/button/?url={post_url}&description={custom_message}"
-        }
+        share_urls = build_share_urls(post_id, custom_message, custom_message)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "post_id": post_id,
             "post_url": post_url,
             "share_urls": share_urls,
-            "generated_at": datetime.utcnow().isoformat()
-        }
+            "generated_at": datetime.utcnow()
+        })
         
     except Exception as e:
         logger.error(f"Error generating share URLs: {e}")
@@ -1,10 +1,132 @@
 # Backend hooks for Social Media Share & Like Plugin
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+import asyncio
+import copy
+import functools
+import inspect
+import itertools
 import logging
+import time
+from urllib.parse import quote_plus
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernel is used as-is
+    njit = None
 
 logger = logging.getLogger(__name__)
 
+_rng = np.random.default_rng()
+
+# Bounds for the simulated per-platform and daily figures (high is exclusive)
+_PLATFORM_LOW = np.array([100, 80, 50, 70, 20, 30, 15])
+_PLATFORM_HIGH = np.array([300, 250, 150, 200, 80, 100, 60]) + 1
+_TREND_LOW = np.array([[50], [20], [100]])
+_TREND_HIGH = np.array([[200], [100], [500]]) + 1
+
+# Event ids: a per-process prefix plus a counter, unique even within one second
+_EVT_PREFIX = f"evt_{int(time.time())}_"
+_SHARE_PREFIX = f"share_{int(time.time())}_"
+_event_counter = itertools.count()
+_share_counter = itertools.count()
+
+SHARE_BASE_URL = "https://your-cms-domain.com"  # Would be configured
+
+VALID_PLATFORMS = ('facebook', 'twitter', 'linkedin', 'whatsapp', 'telegram', 'reddit', 'pinterest')
+VALID_PLATFORMS_SET = frozenset(VALID_PLATFORMS)
+# Per-platform share counters stored on a post, in VALID_PLATFORMS order
+SHARE_KEYS = tuple(f'{platform}_shares' for platform in VALID_PLATFORMS)
+
+# Share URL templates per platform; placeholders are filled with quoted values
+_SHARE_TEMPLATES = (
+    ('facebook', 'https://www.facebook.com/sharer/sharer.php?u={url}'),
+    ('twitter', 'https://twitter.com/intent/tweet?text={text}&url={url}'),
+    ('linkedin', 'https://www.linkedin.com/sharing/share-offsite/?url={url}'),
+    ('whatsapp', 'https://wa.me/?text={text}+{url}'),
+    ('telegram', 'https://t.me/share/url?url={url}&text={text}'),
+    ('reddit', 'https://reddit.com/submit?url={url}&title={title}'),
+    ('pinterest', 'https://pinterest.com/pin/create/button/?url={url}&description={text}')
+)
+
+# Post URLs share a constant prefix, so bake its quoted form into the templates
+# once; per call only the post id, text and title are substituted
+_QUOTED_POST_URL_PREFIX = quote_plus(f"{SHARE_BASE_URL}/posts/")
+_POST_SHARE_TEMPLATES = tuple(
+    (platform, template.replace('{url}', _QUOTED_POST_URL_PREFIX + '{post_id}'))
+    for platform, template in _SHARE_TEMPLATES
+)
+
+_cache_counters = {'hits': 0, 'misses': 0}
+
+def async_ttl_cache(ttl: int = 300, maxsize: int = 128):
+    """Cache an async function's result for ttl seconds, collapsing concurrent misses
+
+    Each decorated function keeps at most maxsize entries, evicting the least
+    recently used. Callers share the cached objects and must not modify them.
+    """
+    
+    def decorator(func):
+        signature = inspect.signature(func)
+        # key -> (expires_at, value), least recently used first
+        cache: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        locks: Dict[str, asyncio.Lock] = {}
+        
+        def lookup(key: str) -> Tuple[bool, Any]:
+            entry = cache.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return False, None
+            cache.move_to_end(key)
+            _cache_counters['hits'] += 1
+            logger.debug("Cache hit for %s%s (hits=%d)", func.__name__, key, _cache_counters['hits'])
+            return True, entry[1]
+        
+        def store(key: str, value: Any) -> None:
+            now = time.monotonic()
+            for expired_key in [k for k, (expires_at, _) in cache.items() if expires_at <= now]:
+                del cache[expired_key]
+            cache[key] = (now + ttl, value)
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Bind arguments so f(5), f(limit=5) and f() with a default of 5 share a key
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = repr(tuple(bound.arguments.items()))
+            
+            hit, value = lookup(key)
+            if hit:
+                return value
+            
+            # Only one caller recomputes an expired key; the others wait for it
+            lock = locks.get(key)
+            if lock is None:
+                lock = locks[key] = asyncio.Lock()
+            async with lock:
+                hit, value = lookup(key)
+                if hit:
+                    return value
+                
+                _cache_counters['misses'] += 1
+                logger.debug("Cache miss for %s%s (misses=%d)", func.__name__, key, _cache_counters['misses'])
+                try:
+                    value = await func(*args, **kwargs)
+                    store(key, value)
+                finally:
+                    # Waiters already hold this lock; later callers hit the fresh entry
+                    locks.pop(key, None)
+                return value
+        
+        wrapper.cache = cache
+        return wrapper
+    
+    return decorator
+
 async def post_meta(data: Dict[str, Any]) -> Dict[str, Any]:
     """Add social media metadata to posts"""
     
@@ -19,23 +141,19 @@ async def post_meta(data: Dict[str, Any]) -> Dict[str, Any]:
         'likes': post_data.get('likes', 0),
         'shares': post_data.get('shares', 0),
         'share_platforms': {
-            'facebook': post_data.get('facebook_shares', 0),
-            'twitter': post_data.get('twitter_shares', 0),
-            'linkedin': post_data.get('linkedin_shares', 0),
-            'whatsapp': post_data.get('whatsapp_shares', 0),
-            'telegram': post_data.get('telegram_shares', 0),
-            'reddit': post_data.get('reddit_shares', 0),
-            'pinterest': post_data.get('pinterest_shares', 0)
+            platform: post_data.get(key, 0)
+            for platform, key in zip(VALID_PLATFORMS, SHARE_KEYS)
         },
         'last_shared': post_data.get('last_shared'),
         'most_shared_platform': get_most_shared_platform(post_data),
         'engagement_score': calculate_engagement_score(post_data)
     }
     
-    return {
-        **data,
-        'social_meta': social_meta
-    }
+    # execute_hook shallow-copies the caller's dict once per call and every hook in
+    # the chain shares that copy; adding a top-level key is safe, editing nested
+    # values is not
+    data['social_meta'] = social_meta
+    return data
 
 async def social_analytics(data: Dict[str, Any]) -> Dict[str, Any]:
     """Process social media analytics data"""
@@ -43,18 +161,17 @@ async def social_analytics(data: Dict[str, Any]) -> Dict[str, Any]:
     try:
         # Get social engagement metrics
         analytics_data = {
-            'total_likes': get_total_likes(),
-            'total_shares': get_total_shares(),
-            'top_shared_posts': get_top_shared_posts(limit=5),
-            'platform_breakdown': get_platform_breakdown(),
-            'engagement_trends': get_engagement_trends(),
-            'viral_posts': get_viral_posts()
+            'total_likes': await get_total_likes(),
+            'total_shares': await get_total_shares(),
+            'top_shared_posts': await get_top_shared_posts(limit=5),
+            'platform_breakdown': await get_platform_breakdown(),
+            'engagement_trends': await get_engagement_trends(),
+            'viral_posts': await get_viral_posts()
         }
         
-        return {
-            **data,
-            'social_analytics': analytics_data
-        }
+        # The values are shared cache entries; later hooks may edit this data
+        data['social_analytics'] = copy.deepcopy(analytics_data)
+        return data
         
     except Exception as e:
         logger.error(f"Error processing social analytics: {e}")
@@ -72,13 +189,7 @@ async def before_post_save(post_data: Dict[str, Any]) -> Dict[str, Any]:
     
     if 'social_meta' not in post_data:
         post_data['social_meta'] = {
-            'facebook_shares': 0,
-            'twitter_shares': 0,
-            'linkedin_shares': 0,
-            'whatsapp_shares': 0,
-            'telegram_shares': 0,
-            'reddit_shares': 0,
-            'pinterest_shares': 0,
+            **dict.fromkeys(SHARE_KEYS, 0),
             'created_at': datetime.utcnow().isoformat(),
             'share_urls': generate_share_urls(post_data)
         }
@@ -117,135 +228,181 @@ def generate_share_urls(post_data: Dict[str, Any]) -> Dict[str, str]:
     
     post_id = post_data.get('id', 'new')
     post_title = post_data.get('title', 'Check out this post!')
-    base_url = "https://your-cms-domain.com"  # Would be configured
-    post_url = f"{base_url}/posts/{post_id}"
-    
     share_text = f"Check out this awesome post: {post_title}"
     
+    return dict(build_share_urls(str(post_id), share_text, post_title))
+
+@functools.lru_cache(maxsize=4096)
+def build_share_urls(post_id: str, share_text: str, title: str) -> Dict[str, str]:
+    """Build share URLs for every platform (cached; callers must not mutate the result)"""
+    
+    post_id = quote_plus(post_id)
+    text = quote_plus(share_text)
+    title = quote_plus(title)
+    
     return {
-        'facebook': f"https://www.facebook.com/sharer/sharer.php?u={post_url}",
-        'twitter': f"https://twitter.com/intent/tweet?text={share_text}&url={post_url}",
-        'linkedin': f"https://www.linkedin.com/sharing/share-offsite/?url={post_url}",
-        'whatsapp': f"https://wa.me/?text={share_text} {post_url}",
-        'telegram': f"https://t.me/share/url?url={post_url}&text={share_text}",
-        'reddit': f"https://reddit.com/submit?url={post_url}&title={post_title}",
-        'pinterest': f"https://pinterest.com/pin/create/button/?url={post_url}&description={share_text}"
+        platform: template.format(post_id=post_id, text=text, title=title)
+        for platform, template in _POST_SHARE_TEMPLATES
     }
 
+def _score_kernel(shares: np.ndarray, likes: np.ndarray) -> np.ndarray:
+    """Weighted engagement scores for an (N, 7) share matrix and N like counts"""
+    return likes * 1.0 + shares.sum(axis=1) * 2.5
+
+if njit is not None:
+    _score_kernel = njit(cache=True, fastmath=True)(_score_kernel)
+    # Compile now so the first request doesn't pay for it
+    _score_kernel(np.zeros((1, len(SHARE_KEYS)), dtype=np.int64), np.zeros(1, dtype=np.int64))
+
+def _share_matrix(posts: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract an (N, 7) share matrix and N like counts from a list of posts"""
+    
+    shares = np.fromiter(
+        (post.get(key, 0) for post in posts for key in SHARE_KEYS),
+        dtype=np.int64,
+        count=len(posts) * len(SHARE_KEYS)
+    ).reshape(len(posts), len(SHARE_KEYS))
+    likes = np.fromiter((post.get('likes', 0) for post in posts), dtype=np.int64, count=len(posts))
+    
+    return shares, likes
+
+def calculate_engagement_scores_batch(posts: List[Dict[str, Any]]) -> List[float]:
+    """Calculate engagement scores for many posts at once"""
+    
+    if not posts:
+        return []
+    
+    shares, likes = _share_matrix(posts)
+    
+    return np.round(_score_kernel(shares, likes), 2).tolist()
+
+def post_meta_batch(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build the post_meta social metadata for a whole feed of posts at once"""
+    
+    if not posts:
+        return []
+    
+    shares, likes = _share_matrix(posts)
+    scores = np.round(_score_kernel(shares, likes), 2).tolist()
+    # argmax returns the first maximum, matching get_most_shared_platform on ties
+    top_idx = shares.argmax(axis=1).tolist()
+    has_shares = (shares.max(axis=1) > 0).tolist()
+    
+    return [
+        {
+            'likes': post.get('likes', 0),
+            'shares': post.get('shares', 0),
+            'share_platforms': dict(zip(VALID_PLATFORMS, row)),
+            'last_shared': post.get('last_shared'),
+            'most_shared_platform': VALID_PLATFORMS[idx] if shared else 'none',
+            'engagement_score': score
+        }
+        for post, row, idx, shared, score in zip(posts, shares.tolist(), top_idx, has_shares, scores)
+    ]
+
 def get_most_shared_platform(post_data: Dict[str, Any]) -> str:
     """Get the platform where this post was shared most"""
     
-    platforms = {
-        'facebook': post_data.get('facebook_shares', 0),
-        'twitter': post_data.get('twitter_shares', 0),
-        'linkedin': post_data.get('linkedin_shares', 0),
-        'whatsapp': post_data.get('whatsapp_shares', 0),
-        'telegram': post_data.get('telegram_shares', 0),
-        'reddit': post_data.get('reddit_shares', 0),
-        'pinterest': post_data.get('pinterest_shares', 0)
-    }
-    
-    if not any(platforms.values()):
-        return 'none'
+    # Strict > keeps the first platform on ties, matching VALID_PLATFORMS order
+    best_platform, best_count = 'none', 0
+    for platform, key in zip(VALID_PLATFORMS, SHARE_KEYS):
+        count = post_data.get(key, 0)
+        if count > best_count:
+            best_platform, best_count = platform, count
     
-    return max(platforms, key=platforms.get)
+    return best_platform
 
 def calculate_engagement_score(post_data: Dict[str, Any]) -> float:
     """Calculate engagement score based on likes and shares"""
     
     likes = post_data.get('likes', 0)
-    total_shares = sum([
-        post_data.get('facebook_shares', 0),
-        post_data.get('twitter_shares', 0),
-        post_data.get('linkedin_shares', 0),
-        post_data.get('whatsapp_shares', 0),
-        post_data.get('telegram_shares', 0),
-        post_data.get('reddit_shares', 0),
-        post_data.get('pinterest_shares', 0)
-    ])
+    total_shares = sum(post_data.get(key, 0) for key in SHARE_KEYS)
     
     # Weighted engagement score (shares worth more than likes)
     engagement_score = (likes * 1.0) + (total_shares * 2.5)
     
     return round(engagement_score, 2)
 
-def get_total_likes() -> int:
+@async_ttl_cache(ttl=300)
+async def get_total_likes() -> int:
     """Get total likes across all posts (mock implementation)"""
     # In a real implementation, this would query the database
-    import random
-    return random.randint(1000, 5000)
+    return int(_rng.integers(1000, 5001))
 
-def get_total_shares() -> int:
+@async_ttl_cache(ttl=300)
+async def get_total_shares() -> int:
     """Get total shares across all posts (mock implementation)"""
-    import random
-    return random.randint(500, 2000)
+    return int(_rng.integers(500, 2001))
 
-def get_top_shared_posts(limit: int = 5) -> List[Dict[str, Any]]:
+@async_ttl_cache(ttl=300)
+async def get_top_shared_posts(limit: int = 5) -> List[Dict[str, Any]]:
     """Get most shared posts (mock implementation)"""
-    import random
     
     # Mock data - in real implementation, would query database
+    shares = _rng.integers(50, 201, size=limit).tolist()
+    likes = _rng.integers(100, 501, size=limit).tolist()
+    scores = _rng.integers(200, 801, size=limit).tolist()
+    
     return [
         {
             'post_id': f'post_{i}',
             'title': f'Popular Post #{i}',
-            'shares': random.randint(50, 200),
-            'likes': random.randint(100, 500),
-            'engagement_score': random.randint(200, 800)
+            'shares': post_shares,
+            'likes': post_likes,
+            'engagement_score': score
         }
-        for i in range(1, limit + 1)
+        for i, post_shares, post_likes, score in zip(range(1, limit + 1), shares, likes, scores)
     ]
 
-def get_platform_breakdown() -> Dict[str, int]:
+@async_ttl_cache(ttl=300)
+async def get_platform_breakdown() -> Dict[str, int]:
     """Get share breakdown by platform (mock implementation)"""
-    import random
     
-    return {
-        'facebook': random.randint(100, 300),
-        'twitter': random.randint(80, 250),
-        'linkedin': random.randint(50, 150),
-        'whatsapp': random.randint(70, 200),
-        'telegram': random.randint(20, 80),
-        'reddit': random.randint(30, 100),
-        'pinterest': random.randint(15, 60)
-    }
+    counts = _rng.integers(_PLATFORM_LOW, _PLATFORM_HIGH).tolist()
+    return dict(zip(VALID_PLATFORMS, counts))
 
-def get_engagement_trends() -> List[Dict[str, Any]]:
+@async_ttl_cache(ttl=300)
+async def get_engagement_trends() -> List[Dict[str, Any]]:
     """Get engagement trends over time (mock implementation)"""
-    from datetime import datetime, timedelta
-    import random
-    
-    trends = []
-    for i in range(7):  # Last 7 days
-        date = datetime.utcnow() - timedelta(days=i)
-        trends.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'likes': random.randint(50, 200),
-            'shares': random.randint(20, 100),
-            'engagement_score': random.randint(100, 500)
-        })
-    
-    return list(reversed(trends))
-
-def get_viral_posts(threshold: int = 100) -> List[Dict[str, Any]]:
+    
+    # One (3, 7) draw: rows are likes, shares and engagement score per day
+    likes, shares, scores = _rng.integers(_TREND_LOW, _TREND_HIGH, size=(3, 7)).tolist()
+    
+    # Last 7 days, oldest first
+    today = datetime.utcnow().date()
+    dates = [(today - timedelta(days=i)).isoformat() for i in range(6, -1, -1)]
+    
+    return [
+        {
+            'date': date,
+            'likes': day_likes,
+            'shares': day_shares,
+            'engagement_score': score
+        }
+        for date, day_likes, day_shares, score in zip(dates, likes, shares, scores)
+    ]
+
+@async_ttl_cache(ttl=300)
+async def get_viral_posts(threshold: int = 100) -> List[Dict[str, Any]]:
     """Get posts that went viral (high share count)"""
-    import random
     
     # Mock viral posts
+    shares = _rng.integers([300, 200], [1001, 801]).tolist()
+    likes = _rng.integers([500, 400], [2001, 1501]).tolist()
     return [
         {
             'post_id': 'viral_1',
             'title': 'This Post Went Viral!',
-            'shares': random.randint(300, 1000),
-            'likes': random.randint(500, 2000),
+            'shares': shares[0],
+            'likes': likes[0],
             'viral_date': (datetime.utcnow() - timedelta(days=2)).isoformat(),
             'top_platform': 'twitter'
         },
         {
             'post_id': 'viral_2', 
             'title': 'Another Viral Hit',
-            'shares': random.randint(200, 800),
-            'likes': random.randint(400, 1500),
+            'shares': shares[1],
+            'likes': likes[1],
             'viral_date': (datetime.utcnow() - timedelta(days=5)).isoformat(),
             'top_platform': 'facebook'
         }
@@ -259,7 +416,7 @@ async def track_like_event(post_id: str, user_id: str, action: str) -> Dict[str,
         'event_type': 'like' if action == 'like' else 'unlike',
         'post_id': post_id,
         'user_id': user_id,
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': datetime.utcnow(),
         'ip_address': 'user_ip_here',  # Would get from request
         'user_agent': 'user_agent_here'  # Would get from request
     }
@@ -269,7 +426,7 @@ async def track_like_event(post_id: str, user_id: str, action: str) -> Dict[str,
     
     return {
         'success': True,
-        'event_id': f"evt_{int(datetime.utcnow().timestamp())}",
+        'event_id': _EVT_PREFIX + str(next(_event_counter)),
         'event_data': event_data
     }
 
@@ -281,7 +438,7 @@ async def track_share_event(post_id: str, platform: str, user_id: str = None) ->
         'post_id': post_id,
         'platform': platform,
         'user_id': user_id,
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': datetime.utcnow(),
         'referrer': 'social_share_plugin'
     }
     
@@ -290,6 +447,6 @@ async def track_share_event(post_id: str, platform: str, user_id: str = None) ->
     
     return {
         'success': True,
-        'event_id': f"share_{int(datetime.utcnow().timestamp())}",
+        'event_id': _SHARE_PREFIX + str(next(_share_counter)),
         'event_data': event_data
     }
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Tests for the Social Media Share & Like plugin's ETag handling"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("orjson")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "plugins" / "social-media-share-&-like" / "backend"
+
+
+def load_endpoints():
+    """Import the plugin's endpoints module, which uses a relative import of its hooks"""
+    package = types.ModuleType("social_share_backend")
+    package.__path__ = [str(BACKEND_DIR)]
+    sys.modules["social_share_backend"] = package
+    return importlib.import_module("social_share_backend.endpoints")
+
+
+endpoints = load_endpoints()
+
+app = FastAPI()
+app.include_router(endpoints.social_router)
+client = TestClient(app)
+
+ETAG_URLS = [
+    "/social/posts/post_1/stats",
+    "/social/top-posts?metric=likes&limit=3",
+    "/social/analytics/overview",
+]
+
+
+@pytest.mark.parametrize("url", ETAG_URLS)
+def test_etag_round_trip(url):
+    response = client.get(url)
+    etag = response.headers["etag"]
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, max-age=60"
+    assert response.json()["success"] is True
+
+    for if_none_match in (etag, f"W/{etag}", "*", f'"other", W/{etag}'):
+        revalidated = client.get(url, headers={"If-None-Match": if_none_match})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+        assert revalidated.content == b""
+
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_etag_response_without_extra_fields():
+    request = types.SimpleNamespace(headers={})
+
+    response = endpoints._etag_response(request, [1, 2])
+
+    assert response.body == b'{"data":[1,2]}'
+
+
+@pytest.mark.parametrize("limit", [0, 101, 10_000_000])
+def test_top_posts_limit_is_bounded(limit):
+    assert client.get(f"/social/top-posts?limit={limit}").status_code == 422
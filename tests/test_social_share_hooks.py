@@ -0,0 +1,146 @@
+"""Tests for the Social Media Share & Like plugin's batch helpers"""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+HOOKS_PATH = Path(__file__).resolve().parent.parent / "plugins" / "social-media-share-&-like" / "backend" / "hooks.py"
+
+
+def load_hooks():
+    """Import the plugin's hooks module straight from its file, as the plugin loader does"""
+    spec = importlib.util.spec_from_file_location("social_share_hooks", HOOKS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+hooks = load_hooks()
+
+POSTS = [
+    # Tie between twitter and reddit: the first platform in VALID_PLATFORMS wins
+    {"id": "tie", "likes": 3, "twitter_shares": 5, "reddit_shares": 5},
+    # No likes or shares at all
+    {"id": "empty"},
+    # Explicit zero counts everywhere
+    {"id": "zeros", "likes": 0, **dict.fromkeys(hooks.SHARE_KEYS, 0)},
+    {"id": "single", "likes": 1, "pinterest_shares": 2, "shares": 2, "last_shared": "2025-01-01T00:00:00"},
+    {"id": "busy", "likes": 120, "facebook_shares": 40, "linkedin_shares": 41, "telegram_shares": 7},
+]
+
+
+def test_post_meta_batch_matches_post_meta():
+    expected = [
+        asyncio.run(hooks.post_meta({"post": post}))["social_meta"]
+        for post in POSTS
+    ]
+
+    assert hooks.post_meta_batch(POSTS) == expected
+
+
+def test_post_meta_batch_tie_and_zero_platforms():
+    metas = hooks.post_meta_batch(POSTS)
+
+    assert metas[0]["most_shared_platform"] == "twitter"
+    assert metas[1]["most_shared_platform"] == "none"
+    assert metas[2]["most_shared_platform"] == "none"
+
+
+def test_post_meta_batch_empty():
+    assert hooks.post_meta_batch([]) == []
+
+
+def test_engagement_scores_batch_matches_single_post_scores():
+    expected = [hooks.calculate_engagement_score(post) for post in POSTS]
+
+    assert hooks.calculate_engagement_scores_batch(POSTS) == expected
+
+
+def test_engagement_scores_batch_empty():
+    assert hooks.calculate_engagement_scores_batch([]) == []
+
+
+def make_counted(ttl=60, maxsize=128, delay=0):
+    """A cached coroutine that records every real call"""
+    calls = []
+
+    @hooks.async_ttl_cache(ttl=ttl, maxsize=maxsize)
+    async def fetch(limit=5):
+        calls.append(limit)
+        await asyncio.sleep(delay)
+        return [{"limit": limit}]
+
+    return fetch, calls
+
+
+def test_ttl_cache_normalizes_arguments():
+    fetch, calls = make_counted()
+
+    async def run():
+        return [await fetch(5), await fetch(limit=5), await fetch()]
+
+    results = asyncio.run(run())
+
+    assert calls == [5]
+    assert results[0] is results[1] is results[2]
+    assert len(fetch.cache) == 1
+
+
+def test_ttl_cache_collapses_concurrent_misses():
+    fetch, calls = make_counted(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*(fetch() for _ in range(10)))
+
+    results = asyncio.run(run())
+
+    assert calls == [5]
+    assert all(result is results[0] for result in results)
+
+
+def test_ttl_cache_expires_and_prunes_entries():
+    fetch, calls = make_counted(ttl=0.01)
+
+    async def run():
+        await fetch(1)
+        await asyncio.sleep(0.02)
+        await fetch(1)
+        await asyncio.sleep(0.02)
+        await fetch(2)
+
+    asyncio.run(run())
+
+    assert calls == [1, 1, 2]
+    # Storing 2 dropped the expired entry for 1
+    assert len(fetch.cache) == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    fetch, calls = make_counted(maxsize=2)
+
+    async def run():
+        await fetch(1)
+        await fetch(2)
+        await fetch(1)
+        await fetch(3)
+        await fetch(1)
+        await fetch(2)
+
+    asyncio.run(run())
+
+    # 2 was the least recently used when 3 arrived, so only it was recomputed
+    assert calls == [1, 2, 3, 2]
+    assert len(fetch.cache) == 2
+
+
+def test_social_analytics_does_not_share_cached_values():
+    async def run():
+        data = await hooks.social_analytics({})
+        data["social_analytics"]["engagement_trends"].clear()
+        return await hooks.get_engagement_trends()
+
+    assert len(asyncio.run(run())) == 7